@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import statistics
+import subprocess
+import tempfile
+
+from snapshot_factory import make_snapshot
+
+# Benchmark startup time: mengukur waktu dari proses dimulai sampai iterasi pertama run() selesai
+# mengevaluasi sinyal (warm start dari snapshot). fetch_ticker/fetch_ohlcv di-stub sehingga
+# tidak perlu koneksi ke Binance; selebihnya jalur yang sama dengan SupertrendLiveBot.run().
+# Jalankan: python benchmark_startup.py [jumlah_run]
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+SYMBOL = 'BTC/USDT'
+TIMEFRAME = '3m'
+
+# Script yang dijalankan di proses baru; argv[1] = waktu (epoch) saat proses di-spawn
+BOT_CHILD = '''
+import sys, time
+sys.path.insert(0, {repo!r})
+from bot import SupertrendLiveBot
+bot = SupertrendLiveBot(symbol={symbol!r}, timeframe={timeframe!r}, snapshot_path={path!r})
+# State (market info, candle, posisi) sudah di memori; exchange belum disentuh
+print('RESTORED', time.time() - float(sys.argv[1]))
+
+# Stub network: top-up hanya mengembalikan ulang candle yang sedang berjalan
+last = bot.candles.iloc[-1]
+bot.exchange.fetch_ticker = lambda symbol: {{'last': float(last['Close'])}}
+bot.exchange.fetch_ohlcv = lambda symbol, timeframe, since=None, limit=None: [
+    [since] + [float(last[col]) for col in ['Open', 'High', 'Low', 'Close', 'Volume']]]
+
+# Iterasi pertama, sama dengan SupertrendLiveBot.run()
+bot.exchange.fetch_ticker(bot.symbol)
+df = bot.update_candles(bot.ohlcv_limit)
+df = bot.prepare_indicators(df)
+if df is not None:
+    bot.check_signals(df)
+print('READY', time.time() - float(sys.argv[1]))
+print('SUPERTREND', int(df is not None))
+'''
+
+# Pembanding: import eager seperti bot.py sebelumnya
+EAGER_CHILD = '''
+import sys, time
+import pandas, numpy, ta, ccxt
+print('IMPORT', time.time() - float(sys.argv[1]))
+'''
+
+
+def run_child(code):
+    # Menjalankan code di interpreter baru dan mengembalikan {label: nilai}
+    result = subprocess.run(
+        [sys.executable, '-c', code, repr(time.time())],
+        capture_output=True, text=True, check=True, cwd=REPO_DIR,
+    )
+    timings = {}
+    for line in result.stdout.splitlines():
+        parts = line.split()
+        if len(parts) == 2 and parts[0] in ('IMPORT', 'RESTORED', 'READY', 'SUPERTREND'):
+            timings[parts[0]] = float(parts[1])
+    return timings
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bot_snapshot.pkl')
+        make_snapshot(path, symbol=SYMBOL, timeframe=TIMEFRAME)
+        bot_code = BOT_CHILD.format(repo=REPO_DIR, symbol=SYMBOL, timeframe=TIMEFRAME, path=path)
+
+        results = {'IMPORT': [], 'RESTORED': [], 'READY': [], 'SUPERTREND': []}
+        for _ in range(runs):
+            for label, value in run_child(EAGER_CHILD).items():
+                results[label].append(value)
+            for label, value in run_child(bot_code).items():
+                results[label].append(value)
+
+    print(f"INFO: Startup benchmark ({runs} run, median / max, detik sejak proses dimulai)")
+    descriptions = {
+        'IMPORT': 'Import eager pandas+numpy+ta+ccxt',
+        'RESTORED': 'Warm start: state snapshot dipulihkan',
+        'READY': 'Warm start: iterasi pertama selesai',
+    }
+    for label, description in descriptions.items():
+        values = results[label]
+        print(f"  {description:<38} {statistics.median(values):.3f} / {max(values):.3f}")
+    if not all(results['SUPERTREND']):
+        print("WARNING: Supertrend gagal dihitung (versi ta terpasang tidak punya supertrend); "
+              "iterasi berhenti sebelum check_signals() seperti di run().")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,48 @@
-import pandas as pd
-import numpy as np
-import ta
-import ccxt
 import os
 import time
+import pickle
+import importlib
+import threading
 from datetime import datetime, time as dt_time, timedelta
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Versi format snapshot; naikkan jika isi snapshot berubah agar snapshot lama diabaikan
+SNAPSHOT_VERSION = 3
+
+# Umur maksimum market info (presisi, tick size) dari snapshot sebelum di-refresh dari Binance
+MARKET_INFO_TTL = timedelta(hours=6)
+
+
+class _LazyModule:
+    """Proxy modul yang baru benar-benar diimpor saat atributnya pertama kali diakses."""
+
+    def __init__(self, name, loader=None):
+        self._name = name
+        self._loader = loader or (lambda: importlib.import_module(name))
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = self._loader()
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+# Modul berat diimpor secara lazy agar startup cepat; pemakaian (pd.DataFrame, ta.trend, ccxt.ROUND)
+# tetap sama seperti import biasa
+pd = _LazyModule('pandas')
+np = _LazyModule('numpy')
+ta = _LazyModule('ta')
+ccxt = _LazyModule('ccxt')
+
 class SupertrendLiveBot:
     def __init__(self, 
                  symbol='BTC/USDT', # Contoh: Bitcoin/USDT
@@ -23,7 +56,8 @@ class SupertrendLiveBot:
                  volume_factor=2.0, # Faktor untuk Volume Spike
                  fee_rate=0.0004,   # Tingkat biaya (0.04% untuk maker/taker)
                  api_key=None,
-                 api_secret=None):
+                 api_secret=None,
+                 snapshot_path=None): # File snapshot state untuk warm start
 
         self.symbol = symbol
         self.timeframe = timeframe
@@ -40,9 +74,20 @@ class SupertrendLiveBot:
         self.price_decimals = None 
         self.max_qty_decimals = None
         self.tick_size = None 
+        self.markets = None # Subset market info (symbol spot + futures) untuk di-seed ke exchange
+        self.markets_loaded_at = None # Waktu market info terakhir dimuat dari Binance
+
+        # Buffer candle OHLCV mentah; indikator dihitung ulang dari buffer di setiap iterasi
+        self.candles = None
+        # Jumlah candle yang diambil (EMA200 + ATR period + buffer)
+        self.ohlcv_limit = self.ohlcv_limit_for(atr_period)
+
+        self.snapshot_path = snapshot_path or os.getenv('BOT_SNAPSHOT_PATH', 'bot_snapshot.pkl')
         
-        # Inisialisasi Binance exchange
-        self.exchange = ccxt.binance({
+        # Konfigurasi Binance exchange; instance dibuat lazy lewat property `exchange`
+        self._exchange = None
+        self._exchange_lock = threading.Lock()
+        self._exchange_config = {
             'apiKey': api_key or os.getenv('BINANCE_API_KEY'),
             'secret': api_secret or os.getenv('BINANCE_SECRET_KEY'),
             'options': {
@@ -50,7 +95,7 @@ class SupertrendLiveBot:
                 # 'testnet': True, # Uncomment ini jika Anda ingin menggunakan Binance Testnet
             },
             'enableRateLimit': True, # Mengatur batas request agar tidak dibanned
-        })
+        }
         
         # Melacak status posisi
         self.position = {
@@ -67,6 +112,15 @@ class SupertrendLiveBot:
             'entry_time': None   # Waktu entry posisi
         }
 
+        # Warm start dari snapshot; jika tidak ada/tidak valid, load market info dari Binance
+        restored = self.restore_snapshot()
+
+        # Inisialisasi exchange di background. Dimulai setelah snapshot dimuat karena impor ccxt
+        # dan impor pandas (saat unpickle) berebut GIL jika berjalan bersamaan
+        self.warm_up_exchange()
+        if restored:
+            return
+
         # Coba load market info
         try:
             self.load_market_info()
@@ -75,13 +129,44 @@ class SupertrendLiveBot:
             print("Pastikan API Key dan Secret Key sudah benar, dan symbol tersedia.")
             exit() # Keluar jika tidak bisa memuat info pasar
 
+    @property
+    def exchange(self):
+        # Instance ccxt.binance dibuat saat pertama kali dibutuhkan (atau oleh warm_up_exchange)
+        if self._exchange is None:
+            with self._exchange_lock:
+                if self._exchange is None:
+                    exchange = ccxt.binance(self._exchange_config)
+                    if self.markets:
+                        # Market dari snapshot: load_markets() tidak perlu request ke Binance
+                        exchange.set_markets(self.markets)
+                    self._exchange = exchange
+        return self._exchange
+
+    def warm_up_exchange(self):
+        """Mengimpor ccxt dan membuat instance exchange di background thread."""
+        def _warm_up():
+            try:
+                self.exchange
+            except Exception as e:
+                print(f"WARNING: Gagal menyiapkan exchange di background: {e}")
+
+        thread = threading.Thread(target=_warm_up, name='exchange-warm-up', daemon=True)
+        thread.start()
+        return thread
+
     def load_market_info(self):
         # Memuat info pasar untuk menentukan presisi harga dan kuantitas
-        markets = self.exchange.load_markets()
+        # reload=True agar market yang di-seed dari snapshot ikut diperbarui
+        markets = self.exchange.load_markets(reload=True)
         if self.symbol not in markets:
             raise Exception(f"Symbol {self.symbol} tidak ditemukan di Binance.")
         
         market = markets[self.symbol]
+
+        # Simpan market symbol ini beserta market futures hasil resolve (BTC/USDT -> BTC/USDT:USDT)
+        # agar bisa di-seed ke exchange saat warm start tanpa load_markets() penuh
+        futures_market = self.exchange.market(self.symbol)
+        self.markets = {self.symbol: market, futures_market['symbol']: futures_market}
         
         # Ambil presisi dari market info
         # 'precision' memberikan jumlah desimal secara langsung
@@ -90,6 +175,7 @@ class SupertrendLiveBot:
         
         # 'tickSize' adalah langkah harga minimum
         self.tick_size = market['limits']['price']['min'] 
+        self.markets_loaded_at = datetime.now()
         
         print(f"INFO: Informasi pasar untuk {self.symbol} dimuat.")
         print(f"  Price Precision (Decimal Places): {self.price_decimals}")
@@ -105,7 +191,7 @@ class SupertrendLiveBot:
                 price, 
                 ccxt.ROUND, 
                 self.price_decimals, 
-                self.exchange.precision_mode
+                self.exchange.precisionMode
             )
         
         # Bulatkan harga ke kelipatan terdekat dari tick_size
@@ -119,7 +205,7 @@ class SupertrendLiveBot:
             rounded_price,
             ccxt.ROUND, # Atau TRUNCATE tergantung kebutuhan, ROUND lebih umum
             self.price_decimals, # Gunakan price_decimals yang di-fetch dari exchange info
-            self.exchange.precision_mode
+            self.exchange.precisionMode
         )
 
     def _round_qty(self, qty):
@@ -131,10 +217,87 @@ class SupertrendLiveBot:
             ccxt.DECIMAL_TO_PRECISION # Mode padding default
         )
 
-    def fetch_ohlcv(self, limit=200):
+    @staticmethod
+    def ohlcv_limit_for(atr_period):
+        # Cukup data untuk semua indikator: EMA200 + ATR period + buffer
+        return atr_period + 200 + 10
+
+    def restore_snapshot(self):
+        """Memulihkan market info, buffer candle dan posisi dari file snapshot."""
+        if not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception as e:
+            print(f"WARNING: Gagal membaca snapshot {self.snapshot_path}: {e}")
+            return False
+
+        if (snapshot.get('version') != SNAPSHOT_VERSION or snapshot.get('symbol') != self.symbol
+                or snapshot.get('timeframe') != self.timeframe):
+            print(f"WARNING: Snapshot {self.snapshot_path} tidak cocok dengan konfigurasi bot. Diabaikan.")
+            return False
+
+        self.price_decimals = snapshot['price_decimals']
+        self.max_qty_decimals = snapshot['max_qty_decimals']
+        self.tick_size = snapshot['tick_size']
+        self.markets_loaded_at = snapshot['markets_loaded_at']
+        self.candles = snapshot['candles']
+        self.position = snapshot['position']
+
+        with self._exchange_lock:
+            self.markets = snapshot['markets']
+            # Exchange mungkin sudah dibuat oleh warm-up thread sebelum snapshot selesai dimuat
+            if self._exchange is not None:
+                self._exchange.set_markets(self.markets)
+
+        print(f"INFO: Snapshot {self.snapshot_path} dimuat (disimpan {snapshot['saved_at']}).")
+        print(f"  Candle di buffer: {0 if self.candles is None else len(self.candles)}, Posisi: {self.position['status']}")
+
+        # Market info dari snapshot bisa sudah usang (perubahan tick size/presisi oleh Binance)
+        if datetime.now() - self.markets_loaded_at > MARKET_INFO_TTL:
+            self.refresh_market_info()
+        return True
+
+    def refresh_market_info(self):
+        """Memuat ulang market info dari Binance di background thread."""
+        def _refresh():
+            try:
+                self.load_market_info()
+            except Exception as e:
+                print(f"WARNING: Gagal me-refresh informasi pasar, tetap memakai data snapshot: {e}")
+
+        thread = threading.Thread(target=_refresh, name='market-info-refresh', daemon=True)
+        thread.start()
+        return thread
+
+    def save_snapshot(self):
+        """Menyimpan state bot ke file snapshot (atomic: tulis ke file sementara lalu rename)."""
+        snapshot = {
+            'version': SNAPSHOT_VERSION,
+            'saved_at': datetime.now(),
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'markets': self.markets,
+            'price_decimals': self.price_decimals,
+            'max_qty_decimals': self.max_qty_decimals,
+            'tick_size': self.tick_size,
+            'markets_loaded_at': self.markets_loaded_at,
+            'candles': self.candles,
+            'position': self.position,
+        }
+        tmp_path = self.snapshot_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            print(f"WARNING: Gagal menyimpan snapshot {self.snapshot_path}: {e}")
+
+    def fetch_ohlcv(self, limit=200, since=None):
         # Mengambil data candlestick dari Binance
         try:
-            ohlcv = self.exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=limit)
+            ohlcv = self.exchange.fetch_ohlcv(self.symbol, self.timeframe, since=since, limit=limit)
             df = pd.DataFrame(ohlcv, columns=['timestamp', 'Open', 'High', 'Low', 'Close', 'Volume'])
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
             df.set_index('timestamp', inplace=True)
@@ -143,6 +306,37 @@ class SupertrendLiveBot:
             print(f"ERROR: Gagal mengambil data OHLCV: {e}")
             return pd.DataFrame()
 
+    def update_candles(self, limit):
+        # Top-up buffer candle: cukup ambil candle sejak candle terakhir di buffer (termasuk candle
+        # terakhir yang mungkin belum close), bukan download penuh di setiap iterasi.
+        # Jika fetch gagal atau candle terakhir tidak up-to-date, kembalikan DataFrame kosong agar
+        # run() melewati iterasi ini, bukan mengevaluasi sinyal dari buffer yang basi.
+        timeframe_ms = self.exchange.parse_timeframe(self.timeframe) * 1000
+        if self.candles is not None and not self.candles.empty:
+            last_ms = int(self.candles.index[-1].timestamp() * 1000)
+            missing_bars = (self.exchange.milliseconds() - last_ms) // timeframe_ms
+            if missing_bars < limit:
+                new_candles = self.fetch_ohlcv(limit=limit, since=last_ms)
+                if new_candles.empty:
+                    return pd.DataFrame()
+                candles = pd.concat([self.candles, new_candles])
+                self.candles = candles[~candles.index.duplicated(keep='last')].tail(limit)
+                return self._current_candles(timeframe_ms)
+
+        # Buffer kosong atau snapshot terlalu lama: download penuh
+        self.candles = self.fetch_ohlcv(limit=limit)
+        return self._current_candles(timeframe_ms)
+
+    def _current_candles(self, timeframe_ms):
+        # Buffer dianggap current jika candle terakhir masih dalam satu timeframe dari waktu sekarang
+        if self.candles.empty:
+            return pd.DataFrame()
+        last_ms = int(self.candles.index[-1].timestamp() * 1000)
+        if self.exchange.milliseconds() - last_ms >= timeframe_ms:
+            print(f"WARNING: Candle terakhir ({self.candles.index[-1]}) tidak up-to-date. Mengabaikan data.")
+            return pd.DataFrame()
+        return self.candles.copy()
+
     def calculate_supertrend(self, df):
         # Menggunakan fungsi supertrend dari library `ta`
         if len(df) < self.atr_period:
@@ -219,6 +413,21 @@ class SupertrendLiveBot:
         
         return df.drop(columns=['Hour'])
 
+    def prepare_indicators(self, df):
+        # Menghitung semua indikator dari buffer candle; None jika Supertrend gagal dihitung
+        # Pastikan ATR dihitung pertama karena digunakan di add_indicators
+        df['ATR'] = ta.volatility.average_true_range(df['High'], df['Low'], df['Close'], window=self.atr_period)
+        
+        # Lanjutkan dengan perhitungan indikator
+        df = self.calculate_supertrend(df) # Ini akan mencoba dua cara untuk supertrend
+        
+        # Penting: Check if 'ST' column was successfully added by calculate_supertrend
+        if 'ST' not in df.columns:
+            return None
+
+        df = self.add_indicators(df)
+        return self.apply_time_filters(df)
+
     def calculate_position_sizes(self, entry_price, atr_value, rr_sl_initial):
         # Calculate risk amount per unit based on entry and initial stop loss
         # The 'rr_sl_initial' determines the initial distance of SL from entry (e.g., 3 * ATR or 8 * ATR)
@@ -518,30 +727,19 @@ class SupertrendLiveBot:
                 current_price = ticker['last']
 
                 # 2. Ambil data OHLCV terbaru dari Binance
-                # Ambil cukup data untuk semua indikator (EMA200 + ATR period + buffer)
-                ohlcv_limit = self.atr_period + 200 + 10 # Buffer for indicator calculation
-                df = self.fetch_ohlcv(limit=ohlcv_limit) 
+                df = self.update_candles(self.ohlcv_limit)
                 
-                if df.empty or len(df) < ohlcv_limit:
+                if df.empty or len(df) < self.ohlcv_limit:
                     print("WARNING: Data OHLCV tidak cukup. Menunggu data lebih banyak...")
                     time.sleep(60) # Tunggu sebentar sebelum mencoba lagi
                     continue
 
-                # Pastikan ATR dihitung pertama karena digunakan di add_indicators
-                df['ATR'] = ta.volatility.average_true_range(df['High'], df['Low'], df['Close'], window=self.atr_period)
-                
-                # Lanjutkan dengan perhitungan indikator
-                df = self.calculate_supertrend(df) # Ini akan mencoba dua cara untuk supertrend
-                
-                # Penting: Check if 'ST' column was successfully added by calculate_supertrend
-                if 'ST' not in df.columns:
+                df = self.prepare_indicators(df)
+                if df is None:
                     print("CRITICAL ERROR: Supertrend calculation failed. Skipping this iteration.")
                     time.sleep(60)
                     continue
 
-                df = self.add_indicators(df)
-                df = self.apply_time_filters(df)
-
                 # Ambil data terbaru setelah semua indikator dihitung
                 last_candle = df.iloc[-1]
                 current_atr = last_candle['ATR']
@@ -682,6 +880,9 @@ class SupertrendLiveBot:
                 # Ini bisa jadi error yang serius, mungkin perlu notifikasi atau exit
                 time.sleep(30) # Tunggu sebentar sebelum looping lagi
 
+            # Simpan state terbaru agar restart berikutnya bisa warm start
+            self.save_snapshot()
+
             # Bot akan tidur 60 detik setiap kali iterasi loop selesai
             # Ini memungkinkan bot untuk cukup responsif
             time.sleep(60) # Pastikan ini ada dan terindentasi dengan benar di akhir loop
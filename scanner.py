@@ -0,0 +1,260 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import ccxt
+import numpy as np
+from requests.adapters import HTTPAdapter
+
+# Mode scanner read-only: mengevaluasi kondisi sinyal SupertrendLiveBot.check_signals()
+# (Supertrend flip + engulfing + EMA50/200 + RSI + volume spike + Valid_Candle)
+# di seluruh perpetual USDT-M Binance pada setiap candle close, tanpa menempatkan order.
+
+class SignalScanner:
+    def __init__(self,
+                 timeframe='3m',     # Timeframe, sama dengan bot
+                 atr_period=10,      # Periode ATR untuk Supertrend
+                 factor=3.0,         # Faktor ATR untuk Supertrend
+                 volume_factor=2.0,  # Faktor untuk Volume Spike
+                 max_workers=20,     # Jumlah request OHLCV paralel
+                 close_delay=1.0,    # Jeda (detik) setelah candle close sebelum scan
+                 universe_refresh=3600): # Interval (detik) memuat ulang daftar symbol
+
+        self.timeframe = timeframe
+        self.atr_period = atr_period
+        self.factor = factor
+        self.volume_factor = volume_factor
+        self.max_workers = max_workers
+        self.close_delay = close_delay
+        self.universe_refresh = universe_refresh
+
+        # Jumlah bar closed yang dibutuhkan, sama dengan ohlcv_limit di bot (EMA200 + ATR + buffer)
+        self.bars = atr_period + 200 + 10
+
+        # Tanpa API key (read-only). Rate limiter ccxt dimatikan karena request diserialisasi per
+        # instance; jumlah request paralel dibatasi lewat max_workers. Klines dengan limit 100-499
+        # berbobot 2, jadi ~300 symbol per scan jauh di bawah limit 2400 weight/menit Binance Futures.
+        self.exchange = ccxt.binance({
+            'options': {'defaultType': 'future'},
+            'enableRateLimit': False,
+        })
+        # Default pool requests hanya 10 koneksi; samakan dengan max_workers agar koneksi tidak
+        # dibuang (dan TLS handshake diulang) di setiap scan
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.exchange.session.mount('https://', adapter)
+        self.timeframe_ms = self.exchange.parse_timeframe(self.timeframe) * 1000
+        self.symbols = []
+        self.universe_loaded_at = None
+
+    def load_universe(self):
+        # Semua perpetual USDT-M yang aktif; reload agar listing baru dan kontrak yang
+        # delisted/settled ikut terdeteksi
+        markets = self.exchange.load_markets(reload=True)
+        self.symbols = sorted(
+            m['symbol'] for m in markets.values()
+            if m.get('swap') and m.get('linear') and m.get('settle') == 'USDT' and m.get('active')
+        )
+        self.universe_loaded_at = time.time()
+        print(f"INFO: {len(self.symbols)} perpetual USDT-M dimuat untuk scanning.")
+        return self.symbols
+
+    def _fetch_symbol(self, symbol):
+        try:
+            # +1 karena candle terakhir yang dikembalikan biasanya candle yang masih berjalan
+            return symbol, self.exchange.fetch_ohlcv(symbol, self.timeframe, limit=self.bars + 1)
+        except Exception as e:
+            print(f"WARNING: Gagal mengambil OHLCV {symbol}: {e}")
+            return symbol, None
+
+    def fetch_candles(self, last_open_ms):
+        """Mengambil OHLCV semua symbol secara paralel dan menyusunnya jadi array 2-D (symbol x bar).
+
+        Hanya symbol dengan `self.bars` candle closed yang berakhir tepat di candle `last_open_ms`
+        yang diikutkan, sehingga semua baris array sejajar di sumbu waktu.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(self._fetch_symbol, self.symbols))
+
+        symbols, rows = [], []
+        for symbol, ohlcv in results:
+            if not ohlcv:
+                continue
+            closed = [c for c in ohlcv if c[0] <= last_open_ms][-self.bars:]
+            if len(closed) == self.bars and closed[-1][0] == last_open_ms:
+                symbols.append(symbol)
+                rows.append(closed)
+
+        if not rows:
+            return symbols, None
+        # Shape (symbol, bar, kolom) -> dict kolom berisi array (symbol, bar)
+        data = np.asarray(rows, dtype=float)
+        candles = {name: data[:, :, i] for i, name in enumerate(['timestamp', 'Open', 'High', 'Low', 'Close', 'Volume'])}
+        return symbols, candles
+
+    def _atr(self, high, low, close):
+        # ATR Wilder, sama dengan ta.volatility.average_true_range (nol sebelum window terpenuhi)
+        window = self.atr_period
+        prev_close = np.concatenate([close[:, :1], close[:, :-1]], axis=1)
+        tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        tr[:, 0] = high[:, 0] - low[:, 0]
+        atr = np.zeros_like(close)
+        atr[:, window - 1] = tr[:, :window].mean(axis=1)
+        for i in range(window, close.shape[1]):
+            atr[:, i] = (atr[:, i - 1] * (window - 1) + tr[:, i]) / window
+        return atr
+
+    @staticmethod
+    def _ewm(values, alpha, min_periods):
+        # Sama dengan pandas ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean()
+        out = np.empty_like(values)
+        out[:, 0] = values[:, 0]
+        for i in range(1, values.shape[1]):
+            out[:, i] = alpha * values[:, i] + (1 - alpha) * out[:, i - 1]
+        out[:, :min_periods - 1] = np.nan
+        return out
+
+    def _supertrend_direction(self, high, low, close, atr):
+        # Supertrend (definisi TradingView); 1 = uptrend, -1 = downtrend seperti ST_Direction di bot
+        hl2 = (high + low) / 2
+        basic_upper = hl2 + self.factor * atr
+        basic_lower = hl2 - self.factor * atr
+        upper = basic_upper.copy()
+        lower = basic_lower.copy()
+        direction = np.full(close.shape, -1, dtype=int)
+        for i in range(self.atr_period, close.shape[1]):
+            lower[:, i] = np.where(
+                (basic_lower[:, i] > lower[:, i - 1]) | (close[:, i - 1] < lower[:, i - 1]),
+                basic_lower[:, i], lower[:, i - 1])
+            upper[:, i] = np.where(
+                (basic_upper[:, i] < upper[:, i - 1]) | (close[:, i - 1] > upper[:, i - 1]),
+                basic_upper[:, i], upper[:, i - 1])
+            prev_up = direction[:, i - 1] == 1
+            direction[:, i] = np.where(
+                prev_up,
+                np.where(close[:, i] < lower[:, i], -1, 1),
+                np.where(close[:, i] > upper[:, i], 1, -1))
+        return direction
+
+    def compute_signals(self, candles):
+        """Menghitung indikator untuk semua symbol sekaligus dan mengevaluasi sinyal di bar terakhir.
+
+        Semua operasi vektor di sumbu symbol; indikator rekursif (ATR, EMA, RSI, Supertrend)
+        diiterasi di sumbu bar. Mengembalikan dict array 1-D (per symbol) untuk bar terakhir.
+        """
+        open_, high, low = candles['Open'], candles['High'], candles['Low']
+        close, volume = candles['Close'], candles['Volume']
+
+        atr = self._atr(high, low, close)
+        direction = self._supertrend_direction(high, low, close, atr)
+        ema50 = self._ewm(close, 2 / (50 + 1), 50)[:, -1]
+        ema200 = self._ewm(close, 2 / (200 + 1), 200)[:, -1]
+
+        # RSI 14, sama dengan ta.momentum.rsi
+        diff = np.diff(close, axis=1, prepend=close[:, :1])
+        avg_gain = self._ewm(np.where(diff > 0, diff, 0.0), 1 / 14, 14)[:, -1]
+        avg_loss = self._ewm(np.where(diff < 0, -diff, 0.0), 1 / 14, 14)[:, -1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+
+        volume_sma = volume[:, -10:].mean(axis=1)
+        # Kontrak tanpa volume (settling/halted) punya SMA nol; rasio dibuat 0 agar tidak NaN
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = np.where(volume_sma > 0, volume[:, -1] / volume_sma, 0.0)
+        volume_spike = volume[:, -1] > volume_sma * self.volume_factor
+
+        o, c = open_[:, -1], close[:, -1]
+        prev_o, prev_c = open_[:, -2], close[:, -2]
+        bullish_engulfing = (prev_c < prev_o) & (c > o) & (c > prev_o) & (o < prev_c)
+        bearish_engulfing = (prev_c > prev_o) & (c < o) & (c < prev_o) & (o > prev_c)
+        valid_candle = np.abs(c - o) >= atr[:, -1] * 0.3
+
+        common = valid_candle & volume_spike & (atr[:, -1] > 0)
+        long_cond = ((direction[:, -1] == 1) & (direction[:, -2] == -1) & bullish_engulfing
+                     & (ema50 > ema200) & (rsi > 50) & common)
+        short_cond = ((direction[:, -1] == -1) & (direction[:, -2] == 1) & bearish_engulfing
+                      & (ema50 < ema200) & (rsi < 50) & common)
+
+        return {
+            'long': long_cond,
+            'short': short_cond,
+            'close': c,
+            'atr': atr[:, -1],
+            'rsi': rsi,
+            'ema50': ema50,
+            'ema200': ema200,
+            'volume_ratio': volume_ratio,
+            'volume_spike': volume_spike,
+            'bullish_engulfing': bullish_engulfing,
+            'bearish_engulfing': bearish_engulfing,
+            'valid_candle': valid_candle,
+        }
+
+    def rank_candidates(self, symbols, signals):
+        # Kandidat diurutkan berdasarkan kekuatan volume spike (Volume / Volume SMA10)
+        candidates = []
+        for i, symbol in enumerate(symbols):
+            if not (signals['long'][i] or signals['short'][i]):
+                continue
+            candidates.append({
+                'symbol': symbol,
+                'side': 'LONG' if signals['long'][i] else 'SHORT',
+                'close': float(signals['close'][i]),
+                'atr': float(signals['atr'][i]),
+                'rsi': float(signals['rsi'][i]),
+                'volume_ratio': float(signals['volume_ratio'][i]),
+            })
+        return sorted(candidates, key=lambda x: x['volume_ratio'], reverse=True)
+
+    def scan(self):
+        """Satu kali scan untuk candle yang terakhir close. Mengembalikan list kandidat terurut."""
+        start = time.perf_counter()
+        now_ms = self.exchange.milliseconds()
+        last_open_ms = (now_ms // self.timeframe_ms) * self.timeframe_ms - self.timeframe_ms
+
+        symbols, candles = self.fetch_candles(last_open_ms)
+        fetched = time.perf_counter()
+        if candles is None:
+            print("WARNING: Tidak ada data OHLCV yang valid untuk di-scan.")
+            return []
+
+        candidates = self.rank_candidates(symbols, self.compute_signals(candles))
+        done = time.perf_counter()
+
+        candle_time = datetime.fromtimestamp(last_open_ms / 1000, timezone.utc).strftime("%Y-%m-%d %H:%M")
+        print(f"INFO: Scan candle {candle_time} UTC: {len(symbols)}/{len(self.symbols)} symbol, "
+              f"fetch {fetched - start:.2f} detik, indikator {done - fetched:.3f} detik, "
+              f"{len(candidates)} kandidat.")
+        for rank, cand in enumerate(candidates, 1):
+            print(f"  {rank:>2}. {cand['side']:<5} {cand['symbol']:<20} Close={cand['close']} "
+                  f"ATR={cand['atr']:.6g} RSI={cand['rsi']:.1f} Vol/SMA={cand['volume_ratio']:.2f}")
+        return candidates
+
+    def run(self):
+        print(f"INFO: Signal scanner mulai berjalan pada timeframe {self.timeframe}...")
+
+        while True:
+            try:
+                # Muat ulang daftar symbol secara berkala; jika gagal, tetap scan dengan daftar lama
+                if self.universe_loaded_at is None or time.time() - self.universe_loaded_at >= self.universe_refresh:
+                    try:
+                        self.load_universe()
+                    except Exception as e:
+                        if not self.symbols:
+                            raise
+                        print(f"WARNING: Gagal memuat ulang daftar symbol, memakai daftar lama: {e}")
+
+                # Tunggu sampai candle berikutnya close
+                now_ms = self.exchange.milliseconds()
+                next_close_ms = (now_ms // self.timeframe_ms + 1) * self.timeframe_ms
+                time.sleep((next_close_ms - now_ms) / 1000 + self.close_delay)
+                self.scan()
+            except ccxt.NetworkError as e:
+                print(f"ERROR: Masalah jaringan: {e}. Mencoba lagi...")
+                time.sleep(5) # Hindari retry beruntun; scan berikutnya tetap menunggu candle close
+            except Exception as e:
+                print(f"CRITICAL ERROR: Terjadi kesalahan tak terduga saat scan: {e}")
+                time.sleep(30)
+
+
+if __name__ == '__main__':
+    SignalScanner().run()
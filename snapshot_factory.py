@@ -0,0 +1,65 @@
+import pickle
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bot import SNAPSHOT_VERSION, SupertrendLiveBot
+
+# Snapshot sintetis untuk benchmark startup dan test, tanpa koneksi ke Binance
+
+
+def _market(symbol, market_type):
+    # Market info minimal dengan struktur seperti hasil ccxt load_markets()
+    base, quote = symbol.split(':')[0].split('/')
+    is_spot = market_type == 'spot'
+    return {
+        'id': base + quote, 'symbol': symbol, 'base': base, 'quote': quote,
+        'settle': None if is_spot else quote, 'baseId': base, 'quoteId': quote,
+        'settleId': None if is_spot else quote, 'type': market_type,
+        'spot': is_spot, 'margin': False, 'swap': not is_spot, 'future': False, 'option': False,
+        'active': True, 'contract': not is_spot, 'linear': None if is_spot else True,
+        'inverse': None if is_spot else False, 'contractSize': None if is_spot else 1.0,
+        'precision': {'amount': 0.001, 'price': 0.1},
+        'limits': {'amount': {'min': 0.001, 'max': None}, 'price': {'min': 0.1, 'max': None},
+                   'cost': {'min': 5.0, 'max': None}, 'leverage': {'min': None, 'max': None}},
+        'info': {},
+    }
+
+
+def make_snapshot(path, symbol='BTC/USDT', timeframe='3m', atr_period=10):
+    # Buffer candle sintetis (random walk) sepanjang ohlcv_limit bot, berakhir di candle yang
+    # sedang berjalan (timestamp sejajar dengan timeframe seperti candle Binance)
+    bars = SupertrendLiveBot.ohlcv_limit_for(atr_period)
+    freq = pd.to_timedelta(timeframe.replace('m', 'min'))
+    rng = np.random.default_rng(0)
+    index = pd.date_range(end=pd.Timestamp.now(tz='UTC').tz_localize(None).floor(freq), periods=bars, freq=freq)
+    close = 60000 + np.cumsum(rng.normal(0, 30, bars))
+    open_ = close + rng.normal(0, 10, bars)
+    candles = pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + 5,
+        'Low': np.minimum(open_, close) - 5,
+        'Close': close,
+        'Volume': rng.uniform(10, 100, bars),
+    }, index=index)
+
+    snapshot = {
+        'version': SNAPSHOT_VERSION,
+        'saved_at': datetime.now(),
+        'symbol': symbol,
+        'timeframe': timeframe,
+        'markets': {symbol: _market(symbol, 'spot'), symbol + ':USDT': _market(symbol + ':USDT', 'swap')},
+        'price_decimals': 1,
+        'max_qty_decimals': 3,
+        'tick_size': 0.1,
+        'markets_loaded_at': datetime.now(),
+        'candles': candles,
+        'position': {
+            'status': 'NONE', 'type': None, 'entry_price': None, 'qty': 0, 'sl': None, 'tp': None,
+            'risk_amount': 0, 'sl_order_id': None, 'tp_order_id': None, 'is_asia_entry': None,
+            'entry_time': None,
+        },
+    }
+    with open(path, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
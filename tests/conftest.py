@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Modul bot ada di root repo (bukan package), jadi tambahkan root ke sys.path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from bot import SupertrendLiveBot
+from snapshot_factory import make_snapshot
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / 'bot_snapshot.pkl')
+    make_snapshot(path) # Symbol/timeframe default sama dengan default bot
+    return path
+
+
+@pytest.fixture
+def live_bot(snapshot_path):
+    # Bot dari snapshot sintetis, tanpa load_markets() ke Binance
+    return SupertrendLiveBot(snapshot_path=snapshot_path)
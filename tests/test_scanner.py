@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+import ta
+
+from scanner import SignalScanner
+
+# Indikator vektor di SignalScanner harus sama dengan SupertrendLiveBot.add_indicators()
+# (Supertrend dikecualikan: versi ta yang terpasang tidak punya supertrend)
+
+
+def _synthetic_candles(symbols, bars, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, (symbols, bars)), axis=1)
+    open_ = close + rng.normal(0, 1, (symbols, bars))
+    volume = rng.uniform(1, 10, (symbols, bars))
+    volume[:, -1] *= rng.choice([1.0, 5.0], symbols) # Sebagian symbol volume spike
+    volume[0] = 0.0 # Kontrak tanpa volume (settling/halted)
+    return {
+        'Open': open_,
+        'High': np.maximum(open_, close) + rng.uniform(0, 1, (symbols, bars)),
+        'Low': np.minimum(open_, close) - rng.uniform(0, 1, (symbols, bars)),
+        'Close': close,
+        'Volume': volume,
+    }
+
+
+def test_scanner_indicators_match_bot(live_bot):
+    scanner = SignalScanner(atr_period=live_bot.atr_period, factor=live_bot.factor,
+                            volume_factor=live_bot.volume_factor)
+    candles = _synthetic_candles(symbols=200, bars=scanner.bars)
+    signals = scanner.compute_signals(candles)
+
+    expected = {key: [] for key in ['ATR', 'EMA50', 'EMA200', 'RSI', 'Volume_Spike',
+                                    'Bullish_Engulfing', 'Bearish_Engulfing', 'Valid_Candle']}
+    for i in range(len(candles['Close'])):
+        df = pd.DataFrame({name: values[i] for name, values in candles.items()})
+        # Urutan sama dengan SupertrendLiveBot.run(): ATR dulu, lalu add_indicators()
+        df['ATR'] = ta.volatility.average_true_range(df['High'], df['Low'], df['Close'], window=live_bot.atr_period)
+        df = live_bot.add_indicators(df)
+        for key in expected:
+            expected[key].append(df[key].iloc[-1])
+
+    np.testing.assert_allclose(signals['atr'], expected['ATR'])
+    np.testing.assert_allclose(signals['ema50'], expected['EMA50'])
+    np.testing.assert_allclose(signals['ema200'], expected['EMA200'])
+    np.testing.assert_allclose(signals['rsi'], expected['RSI'])
+
+    for scanner_key, bot_key in [('volume_spike', 'Volume_Spike'),
+                                 ('bullish_engulfing', 'Bullish_Engulfing'),
+                                 ('bearish_engulfing', 'Bearish_Engulfing'),
+                                 ('valid_candle', 'Valid_Candle')]:
+        bot_values = np.asarray(expected[bot_key], dtype=bool)
+        # Data sintetis harus memuat kasus True dan False agar perbandingan bermakna
+        assert bot_values.any() and not bot_values.all(), bot_key
+        np.testing.assert_array_equal(signals[scanner_key], bot_values, err_msg=bot_key)
+
+
+def _supertrend_reference(high, low, close, atr, factor):
+    # Supertrend skalar per bar mengikuti ta.supertrend() TradingView (Pine: -1 = uptrend);
+    # hasil dikonversi ke konvensi bot (1 = uptrend, -1 = downtrend)
+    upper_prev = lower_prev = supertrend_prev = None
+    directions = []
+    for i in range(len(close)):
+        if atr[i] == 0: # ATR belum tersedia (na di Pine): band dan supertrend juga na
+            upper_prev = lower_prev = supertrend_prev = None
+            directions.append(-1)
+            continue
+        hl2 = (high[i] + low[i]) / 2
+        upper = hl2 + factor * atr[i]
+        lower = hl2 - factor * atr[i]
+        prev_upper = upper_prev if upper_prev is not None else 0.0 # nz(upperBand[1])
+        prev_lower = lower_prev if lower_prev is not None else 0.0
+        upper = upper if upper < prev_upper or close[i - 1] > prev_upper else prev_upper
+        lower = lower if lower > prev_lower or close[i - 1] < prev_lower else prev_lower
+        if upper_prev is None: # na(atr[1])
+            pine_direction = 1
+        elif supertrend_prev == upper_prev:
+            pine_direction = -1 if close[i] > upper else 1
+        else:
+            pine_direction = 1 if close[i] < lower else -1
+        supertrend_prev = lower if pine_direction == -1 else upper
+        upper_prev, lower_prev = upper, lower
+        directions.append(-pine_direction)
+    return np.array(directions)
+
+
+def test_supertrend_direction_matches_scalar_reference():
+    scanner = SignalScanner()
+    candles = _synthetic_candles(symbols=50, bars=scanner.bars, seed=1)
+    high, low, close = candles['High'], candles['Low'], candles['Close']
+    atr = scanner._atr(high, low, close)
+    direction = scanner._supertrend_direction(high, low, close, atr)
+
+    flips = 0
+    for i in range(len(close)):
+        expected = _supertrend_reference(high[i], low[i], close[i], atr[i], scanner.factor)
+        np.testing.assert_array_equal(direction[i], expected, err_msg=f'symbol {i}')
+        flips += int(np.count_nonzero(np.diff(expected)))
+    assert flips > 0 # Data harus memuat perubahan arah trend
+
+
+def _entry_candles(bars, uptrend):
+    # Trend naik stabil, candle -2 bearish kecil, candle terakhir bullish engulfing dengan volume
+    # spike (kondisi LONG selain Supertrend flip). uptrend=False dicerminkan jadi kondisi SHORT.
+    close = np.linspace(100, 200, bars)
+    open_ = close - 0.2
+    open_[-2], close[-2] = close[-3] + 0.3, close[-3] - 0.3
+    open_[-1], close[-1] = close[-2] - 0.2, open_[-2] + 2.0
+    high = np.maximum(open_, close) + 0.1
+    low = np.minimum(open_, close) - 0.1
+    if not uptrend:
+        open_, close, high, low = 400 - open_, 400 - close, 400 - low, 400 - high
+    volume = np.ones(bars)
+    volume[-1] = 5.0
+    return open_, high, low, close, volume
+
+
+def test_long_short_require_supertrend_flip_and_all_filters(monkeypatch):
+    scanner = SignalScanner()
+    rows = [_entry_candles(scanner.bars, uptrend=True), _entry_candles(scanner.bars, uptrend=False)] * 2
+    candles = {name: np.array([row[i] for row in rows])
+               for i, name in enumerate(['Open', 'High', 'Low', 'Close', 'Volume'])}
+    # Volume symbol terakhir tidak spike: filter volume harus menggagalkan sinyal
+    candles['Volume'][3, -1] = 1.0
+
+    # Symbol 0 flip ke uptrend, 1 flip ke downtrend, 2 tetap downtrend (tanpa flip), 3 flip ke downtrend
+    direction = np.full(candles['Close'].shape, -1)
+    direction[0, -1] = 1
+    direction[1, :-1] = 1
+    direction[3, :-1] = 1
+    monkeypatch.setattr(scanner, '_supertrend_direction', lambda high, low, close, atr: direction)
+
+    signals = scanner.compute_signals(candles)
+    assert signals['bullish_engulfing'][0] and signals['bearish_engulfing'][1]
+    assert signals['ema50'][0] > signals['ema200'][0] and signals['rsi'][0] > 50
+    assert signals['ema50'][1] < signals['ema200'][1] and signals['rsi'][1] < 50
+    assert signals['long'].tolist() == [True, False, False, False]
+    assert signals['short'].tolist() == [False, True, False, False]
+
+
+def test_fetch_candles_keeps_only_aligned_symbols(monkeypatch):
+    scanner = SignalScanner()
+    tf = scanner.timeframe_ms
+    last_open_ms = 1_700_000_000_000 // tf * tf
+
+    def rows(end_ms, count):
+        return [[end_ms - tf * i, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(count)][::-1]
+
+    responses = {
+        'OK/USDT:USDT': rows(last_open_ms + tf, scanner.bars + 1), # + candle yang masih berjalan
+        'NEW/USDT:USDT': rows(last_open_ms, 50),                  # listing baru, data kurang
+        'STALE/USDT:USDT': rows(last_open_ms - tf, scanner.bars),  # tidak ada candle terakhir
+        'FAILED/USDT:USDT': None,                                  # fetch gagal
+    }
+    scanner.symbols = list(responses)
+    monkeypatch.setattr(scanner, '_fetch_symbol', lambda symbol: (symbol, responses[symbol]))
+
+    symbols, candles = scanner.fetch_candles(last_open_ms)
+    assert symbols == ['OK/USDT:USDT']
+    assert candles['Close'].shape == (1, scanner.bars)
+    assert candles['timestamp'][0, -1] == last_open_ms # Candle yang masih berjalan dibuang
+
+
+def test_fetch_candles_without_valid_data():
+    scanner = SignalScanner()
+    scanner._fetch_symbol = lambda symbol: (symbol, None)
+    scanner.symbols = ['FAILED/USDT:USDT']
+    assert scanner.fetch_candles(0) == ([], None)
+
+
+def test_rank_candidates_orders_by_volume_ratio():
+    scanner = SignalScanner()
+    signals = {
+        'long': np.array([True, False, False, True]),
+        'short': np.array([False, True, False, False]),
+        'close': np.array([1.0, 2.0, 3.0, 4.0]),
+        'atr': np.array([0.1, 0.2, 0.3, 0.4]),
+        'rsi': np.array([60.0, 40.0, 50.0, 70.0]),
+        'volume_ratio': np.array([2.5, 4.0, 9.0, 3.0]),
+    }
+    candidates = scanner.rank_candidates(['A', 'B', 'C', 'D'], signals)
+
+    # C tidak punya sinyal sehingga tidak masuk, walaupun volume ratio-nya tertinggi
+    assert [(c['symbol'], c['side']) for c in candidates] == [('B', 'SHORT'), ('D', 'LONG'), ('A', 'LONG')]
+    assert candidates[0]['volume_ratio'] == 4.0
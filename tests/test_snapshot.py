@@ -0,0 +1,113 @@
+import pickle
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import bot
+from bot import SNAPSHOT_VERSION, SupertrendLiveBot
+
+# Semua test berjalan tanpa network: exchange.fetch_ohlcv di-stub
+
+
+def _rewrite_snapshot(path, **changes):
+    with open(path, 'rb') as f:
+        snapshot = pickle.load(f)
+    snapshot.update(changes)
+    with open(path, 'wb') as f:
+        pickle.dump(snapshot, f)
+
+
+def _ohlcv_rows(index):
+    # Baris OHLCV format ccxt: [timestamp_ms, open, high, low, close, volume]
+    return [[int(ts.timestamp() * 1000), 1.0, 2.0, 0.5, 1.5, 10.0] for ts in index]
+
+
+def test_snapshot_round_trip(live_bot, tmp_path):
+    live_bot.position.update({'status': 'OPEN', 'type': 'LONG', 'entry_price': 60000.0, 'qty': 0.01})
+    live_bot.snapshot_path = str(tmp_path / 'saved.pkl')
+    live_bot.save_snapshot()
+
+    restored = SupertrendLiveBot(snapshot_path=live_bot.snapshot_path)
+    pd.testing.assert_frame_equal(restored.candles, live_bot.candles)
+    assert restored.position == live_bot.position
+    assert restored.markets == live_bot.markets
+    assert restored.markets_loaded_at == live_bot.markets_loaded_at
+    assert (restored.price_decimals, restored.max_qty_decimals, restored.tick_size) == (1, 3, 0.1)
+
+
+@pytest.mark.parametrize('attr, value', [('symbol', 'ETH/USDT'), ('timeframe', '5m')])
+def test_restore_rejects_config_mismatch(live_bot, attr, value):
+    setattr(live_bot, attr, value)
+    assert not live_bot.restore_snapshot()
+
+
+def test_restore_rejects_old_version(live_bot, snapshot_path):
+    _rewrite_snapshot(snapshot_path, version=SNAPSHOT_VERSION - 1)
+    assert not live_bot.restore_snapshot()
+
+
+def test_stale_market_info_is_refreshed(snapshot_path, monkeypatch):
+    refreshed = []
+    monkeypatch.setattr(SupertrendLiveBot, 'refresh_market_info', lambda self: refreshed.append(True))
+
+    SupertrendLiveBot(snapshot_path=snapshot_path)
+    assert not refreshed
+
+    _rewrite_snapshot(snapshot_path, markets_loaded_at=datetime.now() - bot.MARKET_INFO_TTL - timedelta(minutes=1))
+    SupertrendLiveBot(snapshot_path=snapshot_path)
+    assert refreshed == [True]
+
+
+def test_update_candles_tops_up_from_last_candle(live_bot, monkeypatch):
+    last = live_bot.candles.index[-1]
+    new_index = pd.date_range(start=last, periods=2, freq='3min')
+    calls = []
+
+    def fetch_ohlcv(symbol, timeframe, since=None, limit=None):
+        calls.append(since)
+        return _ohlcv_rows(new_index)
+
+    monkeypatch.setattr(live_bot.exchange, 'fetch_ohlcv', fetch_ohlcv)
+    df = live_bot.update_candles(live_bot.ohlcv_limit)
+
+    assert calls == [int(last.timestamp() * 1000)]
+    assert len(df) == live_bot.ohlcv_limit
+    assert df.index.is_unique
+    assert df.index[-1] == new_index[-1]
+    assert df.loc[last, 'Close'] == 1.5 # Candle terakhir buffer ditimpa versi terbaru
+
+
+def test_update_candles_returns_empty_when_top_up_fails(live_bot, monkeypatch):
+    def fetch_ohlcv(symbol, timeframe, since=None, limit=None):
+        raise bot.ccxt.NetworkError('timeout')
+
+    monkeypatch.setattr(live_bot.exchange, 'fetch_ohlcv', fetch_ohlcv)
+    assert live_bot.update_candles(live_bot.ohlcv_limit).empty
+
+
+def test_update_candles_returns_empty_when_buffer_is_stale(live_bot, monkeypatch):
+    # Buffer berakhir 30 menit lalu dan top-up tidak mengembalikan candle baru
+    live_bot.candles.index = live_bot.candles.index - pd.Timedelta(minutes=30)
+    last = live_bot.candles.index[-1]
+
+    monkeypatch.setattr(live_bot.exchange, 'fetch_ohlcv',
+                        lambda symbol, timeframe, since=None, limit=None: _ohlcv_rows([last]))
+    assert live_bot.update_candles(live_bot.ohlcv_limit).empty
+
+
+def test_update_candles_full_download_when_snapshot_too_old(live_bot, monkeypatch):
+    live_bot.candles.index = live_bot.candles.index - pd.Timedelta(days=2)
+    now = pd.Timestamp.now(tz='UTC').tz_localize(None).floor('3min')
+    calls = []
+
+    def fetch_ohlcv(symbol, timeframe, since=None, limit=None):
+        calls.append(since)
+        return _ohlcv_rows(pd.date_range(end=now, periods=limit, freq='3min'))
+
+    monkeypatch.setattr(live_bot.exchange, 'fetch_ohlcv', fetch_ohlcv)
+    df = live_bot.update_candles(live_bot.ohlcv_limit)
+
+    assert calls == [None]
+    assert len(df) == live_bot.ohlcv_limit
+    assert df.index[-1] == now